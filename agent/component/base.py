@@ -16,6 +16,7 @@
 
 import asyncio
 import re
+import threading
 import time
 from abc import ABC
 import builtins
@@ -388,13 +389,21 @@ class ComponentBase(ABC):
         self._canvas = canvas
         self._id = id
         self._param = param
+        # Latched once cancellation is observed; hot loops can poll this
+        # with a single atomic load instead of re-querying shared state.
+        self._cancel_event = threading.Event()
         self._param.check()
 
     def is_canceled(self) -> bool:
         return self._canvas.is_canceled()
 
     def check_if_canceled(self, message: str = "") -> bool:
+        # Cancellation is one-way, so once observed the latched event answers
+        # without another round-trip to the shared cancel flag.
+        if self._cancel_event.is_set():
+            return True
         if self.is_canceled():
+            self._cancel_event.set()
             task_id = getattr(self._canvas, 'task_id', 'unknown')
             log_message = f"Task {task_id} has been canceled"
             if message:
@@ -15,6 +15,7 @@
 #
 import logging
 import re
+import threading
 import time
 from copy import deepcopy
 import asyncio
@@ -131,6 +132,8 @@ class ToolBase(ComponentBase):
         self._canvas = canvas
         self._id = id
         self._param = param
+        # See ComponentBase: latched by check_if_canceled on first detection
+        self._cancel_event = threading.Event()
         self._param.check()
 
     def get_meta(self) -> dict[str, Any]:
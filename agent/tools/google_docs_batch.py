@@ -0,0 +1,188 @@
+#
+#  Copyright 2025 The InfiniFlow Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+import logging
+import os
+import time
+from abc import ABC
+
+from agent.tools.base import ToolParamBase, ToolBase, ToolMeta
+from agent.tools.google_docs_common import (
+    coalesce_operations,
+    doc_cache_invalidate,
+    docs_service,
+    json_dumps,
+    json_loads,
+    retry_delay,
+    valid_document_id,
+    validate_request_array,
+)
+from agent.tools.google_docs_read import READ_FIELDS
+from common.connection_utils import timeout
+
+SCOPES = (
+    "https://www.googleapis.com/auth/documents",
+    "https://www.googleapis.com/auth/drive"
+)
+
+
+class GoogleDocsBatchParam(ToolParamBase):
+    """
+    Define the Google Docs Batch component parameters.
+    """
+
+    def __init__(self):
+        self.meta: ToolMeta = {
+            "name": "google_docs_batch",
+            "description": """Execute several Google Docs read/write operations in a single batched HTTP request.
+The entries parameter accepts a JSON array where each entry is one of:
+[
+    {"op": "read", "document_id": "..."},
+    {"op": "write", "document_id": "...", "requests": [{"insertText": {"location": {"index": 1}, "text": "Hello"}}]}
+]
+All entries travel in one HTTP round-trip instead of one per operation.
+Returns a JSON object mapping each entry index to its API response or error.""",
+            "parameters": {
+                "entries": {
+                    "type": "string",
+                    "description": "JSON array of batch entries, each with `op` (read/write), `document_id`, and for writes a `requests` array of batchUpdate operations",
+                    "default": "",
+                    "required": True
+                }
+            }
+        }
+        super().__init__()
+        # Service account JSON key - configured by user when adding tool to agent
+        self.service_account_json = ""
+
+    def check(self):
+        self.check_empty(self.service_account_json, "Service Account JSON")
+
+    def get_input_form(self) -> dict[str, dict]:
+        return {
+            "entries": {
+                "name": "Entries (JSON)",
+                "type": "paragraph"
+            }
+        }
+
+
+class GoogleDocsBatch(ToolBase, ABC):
+    component_name = "GoogleDocsBatch"
+
+    @timeout(int(os.environ.get("COMPONENT_EXEC_TIMEOUT", 60)))
+    def _invoke(self, **kwargs):
+        if self.check_if_canceled("GoogleDocsBatch processing"):
+            return
+
+        entries_str = kwargs.get("entries", "").strip()
+
+        if not entries_str:
+            self.set_output("_ERROR", "entries is required")
+            self.set_output("success", False)
+            return "Error: entries is required"
+
+        try:
+            entries = json_loads(entries_str)
+            if not isinstance(entries, list) or not entries:
+                self.set_output("_ERROR", "entries must be a non-empty JSON array")
+                self.set_output("success", False)
+                return "Error: entries must be a non-empty JSON array"
+        except ValueError as e:
+            self.set_output("_ERROR", f"Invalid JSON in entries: {e}")
+            self.set_output("success", False)
+            return f"Error: Invalid JSON in entries: {e}"
+
+        for i, entry in enumerate(entries):
+            if not isinstance(entry, dict) or entry.get("op") not in ("read", "write") or not isinstance(entry.get("document_id"), str) or not entry["document_id"].strip():
+                msg = f"entry {i} must be an object with op (read/write) and document_id"
+                self.set_output("_ERROR", msg)
+                self.set_output("success", False)
+                return f"Error: {msg}"
+            if not valid_document_id(entry["document_id"].strip()):
+                msg = f"entry {i} has an invalid document_id"
+                self.set_output("_ERROR", msg)
+                self.set_output("success", False)
+                return f"Error: {msg}"
+            if entry["op"] == "write":
+                # Same client-side fast-fail and coalescing as GoogleDocsWrite
+                invalid = validate_request_array(entry.get("requests", []))
+                if invalid:
+                    msg = f"entry {i}: {invalid}"
+                    self.set_output("_ERROR", msg)
+                    self.set_output("success", False)
+                    return f"Error: {msg}"
+                entry["requests"] = coalesce_operations(entry.get("requests", []))
+
+        last_e = None
+        for attempt in range(self._param.max_retries + 1):
+            if self.check_if_canceled("GoogleDocsBatch processing"):
+                return
+
+            try:
+                results = {}
+
+                def _collect(request_id, response, exception):
+                    if exception is not None:
+                        results[request_id] = {"error": str(exception)}
+                    else:
+                        results[request_id] = {"response": response}
+
+                with docs_service(self._param.service_account_json, SCOPES) as service:
+                    batch = service.new_batch_http_request(callback=_collect)
+                    for i, entry in enumerate(entries):
+                        document_id = entry["document_id"].strip()
+                        if entry["op"] == "read":
+                            batch.add(service.documents().get(documentId=document_id, fields=READ_FIELDS),
+                                      request_id=str(i))
+                        else:
+                            batch.add(service.documents().batchUpdate(documentId=document_id,
+                                                                      body={"requests": entry["requests"]}),
+                                      request_id=str(i))
+                    # One HTTP round-trip for all sub-requests
+                    batch.execute()
+
+                for entry in entries:
+                    if entry["op"] == "write":
+                        doc_cache_invalidate(entry["document_id"].strip())
+
+                self.set_output("success", True)
+                return json_dumps(results)
+
+            except Exception as e:
+                # Cheap latched check; the loop-top check_if_canceled does
+                # the actual poll of the shared cancel flag
+                if self._cancel_event.is_set():
+                    return
+
+                last_e = e
+                delay = retry_delay(e, attempt, self._param.delay_after_error)
+                if delay is None or attempt >= self._param.max_retries:
+                    break
+                # Formatting a full traceback per retry is costly; reserve it
+                # for the final failure below
+                logging.warning("GoogleDocsBatch retryable error: %s", e)
+                time.sleep(delay)
+
+        if last_e:
+            logging.error("GoogleDocsBatch failed: %s", last_e, exc_info=last_e)
+            self.set_output("_ERROR", str(last_e))
+            self.set_output("success", False)
+            return f"GoogleDocsBatch error: {last_e}"
+
+        assert False, self.output()
+
+    def thoughts(self) -> str:
+        return "Executing batched Google Docs operations..."
@@ -0,0 +1,489 @@
+#
+#  Copyright 2025 The InfiniFlow Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+"""Shared helpers for the Google Docs tools (google_docs_read/google_docs_write)."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from common.misc_utils import thread_pool_exec
+from rag.utils.redis_conn import REDIS_CONN
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    from google.auth.transport.requests import Request as AuthRequest
+    from google.oauth2.service_account import Credentials as ServiceAccountCredentials
+except ImportError:
+    AuthRequest = None
+    ServiceAccountCredentials = None
+
+try:
+    from googleapiclient.discovery import build
+    from googleapiclient.errors import HttpError
+except ImportError:
+    build = None
+    HttpError = None
+
+try:
+    import httplib2
+    from google_auth_httplib2 import AuthorizedHttp
+except ImportError:
+    httplib2 = None
+    AuthorizedHttp = None
+
+DOCS_API_BASE = "https://docs.googleapis.com/v1/documents"
+
+# Upper bound on kept-alive HTTPS connections to the Docs endpoint, for
+# both the sync service pool and each event loop's async client.
+_POOL_SIZE = int(os.environ.get("GDOCS_CONNECTION_POOL_SIZE", 16))
+
+# Parsed credentials are cached process-wide: building them reparses the
+# service account JSON and the RSA private key, which dominates wall clock
+# for small requests. Keyed by a digest of the raw JSON plus the scopes so
+# credential rotation invalidates the entry automatically.
+_CREDS_CACHE = {}
+_CREDS_CACHE_LOCK = threading.Lock()
+
+# Built services are pooled process-wide: the @timeout decorator runs each
+# _invoke in a brand-new thread, so thread-local caching would never hit.
+# Service objects wrap an httplib2 transport which is not thread-safe, so
+# callers check one out exclusively and return it when done; each pooled
+# service keeps its HTTPS connection alive across invocations.
+_SERVICE_POOL = {}
+_SERVICE_POOL_LOCK = threading.Lock()
+
+
+# Google Doc IDs are URL-safe base64-ish strings; anything else would only
+# reach the server to collect a 404, burning a full round-trip.
+_DOC_ID_RE = re.compile(r"^[A-Za-z0-9_-]{25,60}$")
+
+
+def valid_document_id(document_id: str) -> bool:
+    return bool(_DOC_ID_RE.match(document_id))
+
+
+class DocsApiError(RuntimeError):
+    """A non-2xx response from the Google Docs REST API."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def error_status(e: Exception):
+    """Return the HTTP status carried by an API error, or None."""
+    if isinstance(e, DocsApiError):
+        return e.status
+    if HttpError is not None and isinstance(e, HttpError):
+        return e.resp.status
+    return None
+
+
+def json_loads(s: str):
+    """Parse JSON with orjson when available (C-level UTF-8 validation,
+    markedly faster on large LLM-generated operation arrays); raises
+    ValueError on malformed input either way."""
+    if orjson is not None:
+        return orjson.loads(s)
+    return json.loads(s)
+
+
+# Required payload keys of the common batchUpdate request types, compiled
+# once at import. Catching a malformed request here costs a dict lookup and
+# a frozenset subset check; letting the server catch it costs a full HTTP
+# round-trip. Types not listed are left for the server to validate.
+_REQ_SHAPES = {
+    "insertText": frozenset({"text"}),
+    "deleteContentRange": frozenset({"range"}),
+    "replaceAllText": frozenset({"containsText", "replaceText"}),
+    "updateTextStyle": frozenset({"textStyle", "fields"}),
+    "updateParagraphStyle": frozenset({"paragraphStyle", "fields"}),
+    "createParagraphBullets": frozenset({"range", "bulletPreset"}),
+    "deleteParagraphBullets": frozenset({"range"}),
+    "insertTable": frozenset({"rows", "columns"}),
+    "insertInlineImage": frozenset({"uri"}),
+    "insertPageBreak": frozenset(),
+}
+
+
+def validate_request_array(operations) -> str | None:
+    """Cheap structural check of a batchUpdate request array before any
+    network I/O; returns an error message or None when valid."""
+    if not isinstance(operations, list):
+        return "operations must be a JSON array"
+    for i, op in enumerate(operations):
+        if not isinstance(op, dict):
+            return f"operation {i} must be a JSON object"
+        if len(op) != 1:
+            return f"operation {i} must contain exactly one request type, got {len(op)}"
+        # Large arrays repeat a handful of type keys; interning them makes
+        # this lookup (and any later ones on the same strings) an identity
+        # compare against the already-interned literals in _REQ_SHAPES
+        req_type = sys.intern(next(iter(op.keys())))
+        required = _REQ_SHAPES.get(req_type)
+        if required is None:
+            continue
+        payload = op[req_type]
+        if not isinstance(payload, dict):
+            return f"operation {i} ({req_type}) payload must be a JSON object"
+        if not required.issubset(payload):
+            missing = ", ".join(sorted(required - payload.keys()))
+            return f"operation {i} ({req_type}) is missing required keys: {missing}"
+    return None
+
+
+def _utf16_len(text: str) -> int:
+    # Docs API indices count UTF-16 code units, not Python characters
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _merge_inserts(prev: dict, op: dict):
+    """Merge two insertText requests when the second starts exactly where
+    the first ends; returns the combined request or None."""
+    try:
+        if len(prev) != 1 or len(op) != 1:
+            return None
+        p, n = prev["insertText"], op["insertText"]
+        if p["location"].get("segmentId") != n["location"].get("segmentId"):
+            return None
+        if p["location"]["index"] + _utf16_len(p["text"]) != n["location"]["index"]:
+            return None
+    except (KeyError, TypeError):
+        return None
+    return {"insertText": {"location": dict(p["location"]), "text": p["text"] + n["text"]}}
+
+
+def _merge_deletes(prev: dict, op: dict):
+    """Merge two deleteContentRange requests deleting forward from the same
+    start index; returns the combined request or None."""
+    try:
+        if len(prev) != 1 or len(op) != 1:
+            return None
+        p, n = prev["deleteContentRange"]["range"], op["deleteContentRange"]["range"]
+        if p.get("segmentId") != n.get("segmentId"):
+            return None
+        if n["startIndex"] != p["startIndex"]:
+            return None
+        combined = dict(p)
+        combined["endIndex"] = p["endIndex"] + (n["endIndex"] - n["startIndex"])
+    except (KeyError, TypeError):
+        return None
+    return {"deleteContentRange": {"range": combined}}
+
+
+def coalesce_operations(operations: list) -> list:
+    """Collapse runs of adjacent insertText / deleteContentRange requests
+    into single requests in one O(n) pass.
+
+    LLM-generated arrays often contain thousands of one-character edits at
+    contiguous indices; each request costs server-side OT work and inflates
+    the payload, so merging them shrinks both. Only provably equivalent
+    neighbors are merged - anything unclear passes through untouched.
+    """
+    if len(operations) < 2:
+        return operations
+    coalesced = [operations[0]]
+    for op in operations[1:]:
+        merged = _merge_inserts(coalesced[-1], op) or _merge_deletes(coalesced[-1], op)
+        if merged is not None:
+            coalesced[-1] = merged
+        else:
+            coalesced.append(op)
+    return coalesced
+
+
+def json_dumps(obj) -> str:
+    """Serialize `obj` compactly for the LLM context.
+
+    Pretty-printing doubles the payload without adding information, and for
+    multi-MB documents the second tree traversal is pure CPU waste. orjson
+    serializes in C several times faster; fall back to compact stdlib json
+    when it is unavailable.
+
+    Returns str, not bytes: tool results are spliced into LLM messages and
+    the message assembly expects text, so the single decode here is the
+    cheapest point to pay for it.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+# Statuses worth retrying: rate limiting and transient server errors.
+# Anything else in the 4xx range is a permanent client error and retrying
+# only burns wall clock on a request that can never succeed.
+_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+_BACKOFF_CAP = 30.0
+_BACKOFF_JITTER = 1.0
+
+
+def _backoff(attempt: int, base: float) -> float:
+    return min(_BACKOFF_CAP, max(base, 0.5) * (2 ** attempt)) + random.uniform(0, _BACKOFF_JITTER)
+
+
+def delay_for_status(status: int, retry_after: int, attempt: int, base: float):
+    """Return seconds to sleep before retrying `attempt` for an HTTP error
+    `status`, or None if the status is not retryable. The server's
+    `Retry-After` hint is honored when present; otherwise the delay grows
+    exponentially with jitter, capped so a retry storm cannot exceed the
+    component timeout on its own."""
+    if status not in _RETRYABLE_STATUSES:
+        return None
+    if retry_after > 0:
+        return min(float(retry_after), _BACKOFF_CAP)
+    return _backoff(attempt, base)
+
+
+def retry_delay(e: Exception, attempt: int, base: float):
+    """Like delay_for_status but classifying an exception. Non-HTTP errors
+    (DNS, connection reset, ...) are treated as transient."""
+    if HttpError is not None and isinstance(e, HttpError):
+        try:
+            retry_after = int(e.resp.get("retry-after", 0))
+        except (TypeError, ValueError):
+            retry_after = 0
+        return delay_for_status(e.resp.status, retry_after, attempt, base)
+    return _backoff(attempt, base)
+
+
+if ServiceAccountCredentials is not None:
+    class _SharedTokenCredentials(ServiceAccountCredentials):
+        """Service-account credentials whose access token is shared across
+        worker processes through Redis.
+
+        Each gunicorn/celery worker otherwise mints its own token on cold
+        start, paying one OAuth endpoint round-trip apiece. The first worker
+        to refresh publishes the token with a TTL 60s short of its expiry;
+        the others reuse it. Redis being unreachable just degrades to the
+        normal in-process refresh (a duplicate mint is harmless, tokens are
+        not single-use), so no inter-process lock is taken.
+        """
+
+        _cache_key = ""
+
+        def refresh(self, request):
+            redis_key = f"gdocs-sa-{self._cache_key}-token"
+            if self._cache_key:
+                try:
+                    cached = REDIS_CONN.get(redis_key)
+                    if cached:
+                        data = json_loads(cached)
+                        expiry = datetime.fromisoformat(data["expiry"])
+                        if expiry - datetime.utcnow() > timedelta(seconds=60):
+                            self.token = data["token"]
+                            self.expiry = expiry
+                            return
+                except Exception as e:
+                    logging.warning("Shared Google token cache read failed: %s", e)
+            super().refresh(request)
+            if self._cache_key and self.token and self.expiry:
+                try:
+                    ttl = int((self.expiry - datetime.utcnow()).total_seconds()) - 60
+                    if ttl > 0:
+                        REDIS_CONN.set(redis_key, json_dumps({"token": self.token, "expiry": self.expiry.isoformat()}), exp=ttl)
+                except Exception as e:
+                    logging.warning("Shared Google token cache write failed: %s", e)
+else:
+    _SharedTokenCredentials = None
+
+
+def _get_credentials(service_account_json: str, scopes: tuple):
+    if ServiceAccountCredentials is None:
+        raise RuntimeError("google-auth is not installed; Google Docs tools are unavailable")
+    key = (hashlib.sha256(service_account_json.encode("utf-8")).hexdigest(), scopes)
+    with _CREDS_CACHE_LOCK:
+        creds = _CREDS_CACHE.get(key)
+        if creds is None:
+            creds = _SharedTokenCredentials.from_service_account_info(
+                json.loads(service_account_json), scopes=list(scopes)
+            )
+            # The token is scope-dependent, so the shared-cache key covers
+            # both the account and the scopes
+            creds._cache_key = hashlib.sha256(f"{key[0]}:{','.join(scopes)}".encode("utf-8")).hexdigest()
+            _CREDS_CACHE[key] = creds
+    return key, creds
+
+
+# Serialized documents cached by (document_id, field mask) together with the
+# revision they were fetched at. Repeat reads of an unchanged doc then cost a
+# ~200-byte revisionId probe instead of a full body fetch. Writes invalidate
+# the document's entries so both tools stay coherent.
+_DOC_CACHE_MAX = 128
+_DOC_CACHE = OrderedDict()
+_DOC_CACHE_LOCK = threading.Lock()
+
+
+def doc_cache_get(document_id: str, fields: str, revision_id: str):
+    """Return the cached payload for the doc at `revision_id`, or None."""
+    key = (document_id, fields)
+    with _DOC_CACHE_LOCK:
+        entry = _DOC_CACHE.get(key)
+        if entry and entry[0] == revision_id:
+            _DOC_CACHE.move_to_end(key)
+            return entry[1]
+    return None
+
+
+def doc_cache_put(document_id: str, fields: str, revision_id: str, payload: str):
+    if not revision_id:
+        return
+    key = (document_id, fields)
+    with _DOC_CACHE_LOCK:
+        _DOC_CACHE[key] = (revision_id, payload)
+        _DOC_CACHE.move_to_end(key)
+        while len(_DOC_CACHE) > _DOC_CACHE_MAX:
+            _DOC_CACHE.popitem(last=False)
+
+
+def doc_cache_invalidate(document_id: str):
+    with _DOC_CACHE_LOCK:
+        for key in [k for k in _DOC_CACHE if k[0] == document_id]:
+            del _DOC_CACHE[key]
+
+
+# httpx keep-alive connections and pool primitives are bound to the event
+# loop that created them, and this framework runs each invocation in its
+# own short-lived loop (ToolBase.invoke / Canvas run invoke_async via
+# asyncio.run on pool threads), often with several loops alive at once.
+# A single shared client would hand a connection created on one loop to
+# another ("Event loop is closed"), so clients are cached per running loop
+# and entries for closed loops are pruned; their connections die with the
+# loop.
+_ASYNC_CLIENTS = {}
+_ASYNC_CLIENT_LOCK = threading.Lock()
+_TOKEN_REFRESH_LOCK = threading.Lock()
+
+
+def _get_async_client():
+    loop = asyncio.get_running_loop()
+    with _ASYNC_CLIENT_LOCK:
+        client = _ASYNC_CLIENTS.get(loop)
+        if client is None:
+            for stale in [lp for lp in _ASYNC_CLIENTS if lp.is_closed()]:
+                del _ASYNC_CLIENTS[stale]
+            limits = httpx.Limits(max_connections=_POOL_SIZE, max_keepalive_connections=_POOL_SIZE)
+            try:
+                # HTTP/2 multiplexes concurrent calls over one TLS
+                # connection; requires the optional h2 package.
+                client = httpx.AsyncClient(timeout=30.0, limits=limits, http2=True)
+            except ImportError:
+                client = httpx.AsyncClient(timeout=30.0, limits=limits)
+            _ASYNC_CLIENTS[loop] = client
+    return client
+
+
+def get_access_token(service_account_json: str, scopes: tuple) -> str:
+    """Return a valid OAuth access token for the cached credentials,
+    refreshing it (blocking) only when expired."""
+    _, creds = _get_credentials(service_account_json, scopes)
+    with _TOKEN_REFRESH_LOCK:
+        if not creds.valid:
+            creds.refresh(AuthRequest())
+        return creds.token
+
+
+async def docs_request_async(method: str, path: str, service_account_json: str, scopes: tuple,
+                             params=None, json_body=None, max_retries: int = 0, base_delay: float = 2.0):
+    """Issue a Google Docs REST request on the event loop and return the
+    parsed response.
+
+    `path` is appended to the documents endpoint (e.g. "{id}" for get,
+    "{id}:batchUpdate" for writes). Retries follow the same backoff policy
+    as the sync path; only the token refresh runs in a worker thread, so
+    hundreds of doc calls can share one event loop. Raises on failure.
+    """
+    if httpx is None or AuthRequest is None or ServiceAccountCredentials is None:
+        raise RuntimeError("httpx and google-auth are required for async Google Docs requests")
+
+    client = _get_async_client()
+    url = f"{DOCS_API_BASE}/{path}"
+    last_exc = None
+    for attempt in range(max_retries + 1):
+        try:
+            token = await thread_pool_exec(get_access_token, service_account_json, scopes)
+            resp = await client.request(method, url, params=params, json=json_body,
+                                        headers={"Authorization": f"Bearer {token}"})
+            if resp.status_code < 300:
+                return json_loads(resp.content)
+            try:
+                retry_after = int(resp.headers.get("retry-after", 0))
+            except (TypeError, ValueError):
+                retry_after = 0
+            last_exc = DocsApiError(resp.status_code, f"Google Docs API returned {resp.status_code}: {resp.text[:1000]}")
+            delay = delay_for_status(resp.status_code, retry_after, attempt, base_delay)
+        except (httpx.HTTPError, OSError) as e:
+            last_exc = e
+            delay = _backoff(attempt, base_delay)
+        if delay is None or attempt >= max_retries:
+            break
+        logging.warning("Google Docs API retryable error: %s", last_exc)
+        await asyncio.sleep(delay)
+    raise last_exc
+
+
+def _build_service(creds):
+    # static_discovery uses the discovery document bundled with the client
+    # library instead of fetching it over HTTP on every build
+    if AuthorizedHttp is not None:
+        # An explicit AuthorizedHttp pins one kept-alive TLS connection to
+        # the built service; the default transport would be rebuilt per use
+        http = AuthorizedHttp(creds, http=httplib2.Http())
+        return build("docs", "v1", http=http, cache_discovery=False, static_discovery=True)
+    return build("docs", "v1", credentials=creds, cache_discovery=False, static_discovery=True)
+
+
+@contextmanager
+def docs_service(service_account_json: str, scopes: tuple):
+    """Check a Google Docs API service out of the shared pool for the given
+    service account, building one only when the pool is empty.
+
+    The service is returned to the pool on clean exit; if the body raised,
+    it is discarded together with its possibly broken connection.
+    """
+    if build is None:
+        raise RuntimeError("google-api-python-client is not installed; Google Docs tools are unavailable")
+    key, creds = _get_credentials(service_account_json, scopes)
+
+    with _SERVICE_POOL_LOCK:
+        pool = _SERVICE_POOL.get(key)
+        service = pool.pop() if pool else None
+    if service is None:
+        service = _build_service(creds)
+
+    yield service
+
+    with _SERVICE_POOL_LOCK:
+        pool = _SERVICE_POOL.setdefault(key, [])
+        if len(pool) < _POOL_SIZE:
+            pool.append(service)
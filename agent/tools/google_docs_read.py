@@ -13,15 +13,33 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
-import json
 import logging
 import os
 import time
 from abc import ABC
 
 from agent.tools.base import ToolParamBase, ToolBase, ToolMeta
+from agent.tools.google_docs_common import (
+    doc_cache_get,
+    doc_cache_put,
+    docs_request_async,
+    docs_service,
+    json_dumps,
+    retry_delay,
+    valid_document_id,
+)
 from common.connection_utils import timeout
 
+SCOPES = (
+    "https://www.googleapis.com/auth/documents.readonly",
+    "https://www.googleapis.com/auth/drive.readonly"
+)
+
+# Default field mask: body text plus the indices needed for precise edits.
+# Suggestions, footnotes and styling metadata often dominate the payload
+# (5-10x) and the agent never uses them; pass fields="*" to fetch everything.
+READ_FIELDS = "documentId,revisionId,title,body(content(startIndex,endIndex,paragraph(elements(startIndex,endIndex,textRun(content)))))"
+
 
 class GoogleDocsReadParam(ToolParamBase):
     """
@@ -33,13 +51,19 @@ class GoogleDocsReadParam(ToolParamBase):
             "name": "google_docs_read",
             "description": """Read content from a Google Doc by document ID.
 The document_id can be found in the Google Doc URL: https://docs.google.com/document/d/{document_id}/edit
-Returns the full document JSON structure including body content, styles, and element indices for precise editing.""",
+Returns the document JSON structure with body content and element indices for precise editing; pass fields=* for the full structure including styles.""",
             "parameters": {
                 "document_id": {
                     "type": "string",
                     "description": "The Google Doc document ID (extracted from the document URL)",
                     "default": "{sys.query}",
                     "required": True
+                },
+                "fields": {
+                    "type": "string",
+                    "description": "Optional field mask limiting the returned document JSON; defaults to body text with element indices. Pass * to fetch the full document including styles and suggestions",
+                    "default": "",
+                    "required": False
                 }
             }
         }
@@ -62,63 +86,122 @@ Returns the full document JSON structure including body content, styles, and ele
 class GoogleDocsRead(ToolBase, ABC):
     component_name = "GoogleDocsRead"
 
-    def _get_docs_service(self):
-        """Build and return Google Docs API service using service account."""
-        from google.oauth2.service_account import Credentials as ServiceAccountCredentials
-        from googleapiclient.discovery import build
-
-        SCOPES = [
-            "https://www.googleapis.com/auth/documents.readonly",
-            "https://www.googleapis.com/auth/drive.readonly"
-        ]
-
-        service_account_info = json.loads(self._param.service_account_json)
-        creds = ServiceAccountCredentials.from_service_account_info(
-            service_account_info, scopes=SCOPES
-        )
-        return build("docs", "v1", credentials=creds)
-
     @timeout(int(os.environ.get("COMPONENT_EXEC_TIMEOUT", 60)))
     def _invoke(self, **kwargs):
         if self.check_if_canceled("GoogleDocsRead processing"):
             return
 
         document_id = kwargs.get("document_id", "").strip()
+        fields = kwargs.get("fields", "").strip() or READ_FIELDS
 
         if not document_id:
             self.set_output("_ERROR", "document_id is required")
             self.set_output("success", False)
             return "Error: document_id is required"
 
-        last_e = ""
-        for _ in range(self._param.max_retries + 1):
+        if not valid_document_id(document_id):
+            self.set_output("_ERROR", f"invalid document_id: {document_id[:60]}")
+            self.set_output("success", False)
+            return f"Error: invalid document_id: {document_id[:60]}"
+
+        last_e = None
+        for attempt in range(self._param.max_retries + 1):
             if self.check_if_canceled("GoogleDocsRead processing"):
                 return
 
             try:
-                service = self._get_docs_service()
-                # Get full document JSON
-                document = service.documents().get(documentId=document_id).execute()
-
-                # Return full document JSON as string for LLM context
-                return json.dumps(document, indent=2)
+                with docs_service(self._param.service_account_json, SCOPES) as service:
+                    # Probe the revision first (tiny payload); an unchanged
+                    # doc is served from the cache without refetching the body
+                    rev = service.documents().get(documentId=document_id, fields="revisionId").execute().get("revisionId", "")
+                    cached = doc_cache_get(document_id, fields, rev)
+                    if cached is not None:
+                        return cached
+
+                    # Get document JSON, masked down to the fields the agent uses
+                    document = service.documents().get(documentId=document_id, fields=fields).execute()
+
+                # Return compact document JSON as string for LLM context
+                payload = json_dumps(document)
+                doc_cache_put(document_id, fields, document.get("revisionId") or rev, payload)
+                return payload
 
             except Exception as e:
-                if self.check_if_canceled("GoogleDocsRead processing"):
+                # Cheap latched check; the loop-top check_if_canceled does
+                # the actual poll of the shared cancel flag
+                if self._cancel_event.is_set():
                     return
 
-                last_e = str(e)
-                logging.exception(f"GoogleDocsRead error: {e}")
-                time.sleep(self._param.delay_after_error)
+                last_e = e
+                delay = retry_delay(e, attempt, self._param.delay_after_error)
+                if delay is None or attempt >= self._param.max_retries:
+                    break
+                # Formatting a full traceback per retry is costly; reserve it
+                # for the final failure below
+                logging.warning("GoogleDocsRead retryable error: %s", e)
+                time.sleep(delay)
 
         if last_e:
-            self.set_output("_ERROR", last_e)
+            logging.error("GoogleDocsRead failed: %s", last_e, exc_info=last_e)
+            self.set_output("_ERROR", str(last_e))
             self.set_output("success", False)
             return f"GoogleDocsRead error: {last_e}"
 
         assert False, self.output()
 
+    @timeout(int(os.environ.get("COMPONENT_EXEC_TIMEOUT", 60)))
+    async def _invoke_async(self, **kwargs):
+        """Event-loop variant of _invoke: the HTTP round-trip is awaited on a
+        shared connection pool instead of blocking a worker thread."""
+        if self.check_if_canceled("GoogleDocsRead processing"):
+            return
+
+        document_id = kwargs.get("document_id", "").strip()
+        fields = kwargs.get("fields", "").strip() or READ_FIELDS
+
+        if not document_id:
+            self.set_output("_ERROR", "document_id is required")
+            self.set_output("success", False)
+            return "Error: document_id is required"
+
+        if not valid_document_id(document_id):
+            self.set_output("_ERROR", f"invalid document_id: {document_id[:60]}")
+            self.set_output("success", False)
+            return f"Error: invalid document_id: {document_id[:60]}"
+
+        try:
+            probe = await docs_request_async(
+                "GET", document_id, self._param.service_account_json, SCOPES,
+                params={"fields": "revisionId"},
+                max_retries=self._param.max_retries,
+                base_delay=self._param.delay_after_error)
+            rev = probe.get("revisionId", "")
+            cached = doc_cache_get(document_id, fields, rev)
+            if cached is not None:
+                return cached
+
+            document = await docs_request_async(
+                "GET", document_id, self._param.service_account_json, SCOPES,
+                params={"fields": fields},
+                max_retries=self._param.max_retries,
+                base_delay=self._param.delay_after_error)
+            payload = json_dumps(document)
+            doc_cache_put(document_id, fields, document.get("revisionId") or rev, payload)
+            return payload
+        except Exception as e:
+            if self._cancel_event.is_set():
+                return
+            logging.error("GoogleDocsRead failed: %s", e, exc_info=e)
+            self.set_output("_ERROR", str(e))
+            self.set_output("success", False)
+            return f"GoogleDocsRead error: {e}"
+
     def thoughts(self) -> str:
-        inputs = self.get_input()
-        doc_id = inputs.get("document_id", "")
-        return f"Reading Google Doc: {doc_id[:30]}..." if doc_id else "Reading Google Doc..."
+        # thoughts() fires on every trace event; cache the slice keyed on the
+        # current ID, since the tool object is reused across invocations with
+        # different documents
+        doc_id = self.get_input().get("document_id", "")
+        if getattr(self, "_doc_id_cached", None) != doc_id:
+            self._doc_id_cached = doc_id
+            self._doc_id_preview = doc_id[:30]
+        return f"Reading Google Doc: {self._doc_id_preview}..." if self._doc_id_preview else "Reading Google Doc..."
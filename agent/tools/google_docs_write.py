@@ -13,15 +13,38 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
-import json
 import logging
 import os
 import time
 from abc import ABC
 
 from agent.tools.base import ToolParamBase, ToolBase, ToolMeta
+from agent.tools.google_docs_common import (
+    coalesce_operations,
+    doc_cache_invalidate,
+    docs_request_async,
+    docs_service,
+    error_status,
+    json_dumps,
+    json_loads,
+    retry_delay,
+    valid_document_id,
+    validate_request_array,
+)
 from common.connection_utils import timeout
 
+SCOPES = (
+    "https://www.googleapis.com/auth/documents",
+    "https://www.googleapis.com/auth/drive"
+)
+
+
+# A single batchUpdate with thousands of requests risks the API's request
+# size/time limits; oversized arrays are split into sequential chunks.
+# Chunks cannot run in parallel: requests are applied in order and every
+# insert/delete shifts the indices later requests refer to.
+_MAX_OPS_PER_BATCH = 500
+
 
 class GoogleDocsWriteParam(ToolParamBase):
     """
@@ -52,6 +75,12 @@ Returns the response from the batchUpdate API call.""",
                     "description": "JSON array of Google Docs API batchUpdate requests",
                     "default": "",
                     "required": True
+                },
+                "required_revision_id": {
+                    "type": "string",
+                    "description": "Optional revision ID the document must still be at for the write to apply (from a prior read); the API rejects the write with a conflict if the document changed, so no separate re-read is needed",
+                    "default": "",
+                    "required": False
                 }
             }
         }
@@ -78,22 +107,6 @@ Returns the response from the batchUpdate API call.""",
 class GoogleDocsWrite(ToolBase, ABC):
     component_name = "GoogleDocsWrite"
 
-    def _get_docs_service(self):
-        """Build and return Google Docs API service using service account."""
-        from google.oauth2.service_account import Credentials as ServiceAccountCredentials
-        from googleapiclient.discovery import build
-
-        SCOPES = [
-            "https://www.googleapis.com/auth/documents",
-            "https://www.googleapis.com/auth/drive"
-        ]
-
-        service_account_info = json.loads(self._param.service_account_json)
-        creds = ServiceAccountCredentials.from_service_account_info(
-            service_account_info, scopes=SCOPES
-        )
-        return build("docs", "v1", credentials=creds)
-
     @timeout(int(os.environ.get("COMPONENT_EXEC_TIMEOUT", 60)))
     def _invoke(self, **kwargs):
         if self.check_if_canceled("GoogleDocsWrite processing"):
@@ -107,54 +120,187 @@ class GoogleDocsWrite(ToolBase, ABC):
             self.set_output("success", False)
             return "Error: document_id is required"
 
+        if not valid_document_id(document_id):
+            self.set_output("_ERROR", f"invalid document_id: {document_id[:60]}")
+            self.set_output("success", False)
+            return f"Error: invalid document_id: {document_id[:60]}"
+
         if not operations_str:
             self.set_output("_ERROR", "operations is required")
             self.set_output("success", False)
             return "Error: operations is required"
 
         try:
-            operations = json.loads(operations_str)
-            if not isinstance(operations, list):
-                self.set_output("_ERROR", "operations must be a JSON array")
-                self.set_output("success", False)
-                return "Error: operations must be a JSON array"
-        except json.JSONDecodeError as e:
+            operations = json_loads(operations_str)
+        except ValueError as e:
             self.set_output("_ERROR", f"Invalid JSON in operations: {e}")
             self.set_output("success", False)
             return f"Error: Invalid JSON in operations: {e}"
 
-        last_e = ""
-        for _ in range(self._param.max_retries + 1):
-            if self.check_if_canceled("GoogleDocsWrite processing"):
-                return
+        invalid = validate_request_array(operations)
+        if invalid:
+            self.set_output("_ERROR", invalid)
+            self.set_output("success", False)
+            return f"Error: {invalid}"
 
-            try:
-                service = self._get_docs_service()
-                # Execute batchUpdate with the provided operations
-                result = service.documents().batchUpdate(
-                    documentId=document_id,
-                    body={"requests": operations}
-                ).execute()
+        operations = coalesce_operations(operations)
 
-                self.set_output("success", True)
-                return json.dumps(result, indent=2)
+        required_revision_id = (kwargs.get("required_revision_id", "") or "").strip()
+        merged = {"documentId": document_id, "replies": []}
 
-            except Exception as e:
+        for start in range(0, len(operations), _MAX_OPS_PER_BATCH):
+            chunk = operations[start:start + _MAX_OPS_PER_BATCH]
+            body = self._build_body(chunk, required_revision_id)
+
+            result = None
+            last_e = None
+            for attempt in range(self._param.max_retries + 1):
                 if self.check_if_canceled("GoogleDocsWrite processing"):
                     return
 
-                last_e = str(e)
-                logging.exception(f"GoogleDocsWrite error: {e}")
-                time.sleep(self._param.delay_after_error)
+                try:
+                    with docs_service(self._param.service_account_json, SCOPES) as service:
+                        # Execute batchUpdate with this chunk of operations
+                        result = service.documents().batchUpdate(
+                            documentId=document_id,
+                            body=body
+                        ).execute()
+                    break
+
+                except Exception as e:
+                    # Cheap latched check; the loop-top check_if_canceled does
+                    # the actual poll of the shared cancel flag
+                    if self._cancel_event.is_set():
+                        return
+
+                    if error_status(e) == 409:
+                        return self._conflict_error(document_id)
+
+                    last_e = e
+                    delay = retry_delay(e, attempt, self._param.delay_after_error)
+                    if delay is None or attempt >= self._param.max_retries:
+                        break
+                    # Formatting a full traceback per retry is costly;
+                    # reserve it for the final failure below
+                    logging.warning("GoogleDocsWrite retryable error: %s", e)
+                    time.sleep(delay)
+
+            if result is None:
+                # Earlier chunks may already have applied
+                doc_cache_invalidate(document_id)
+                logging.error("GoogleDocsWrite failed: %s", last_e, exc_info=last_e)
+                self.set_output("_ERROR", str(last_e))
+                self.set_output("success", False)
+                return f"GoogleDocsWrite error: {last_e}"
+
+            merged["replies"].extend(result.get("replies", []))
+            write_control = result.get("writeControl")
+            if write_control:
+                merged["writeControl"] = write_control
+                # Chain optimistic concurrency through subsequent chunks
+                required_revision_id = write_control.get("requiredRevisionId", "")
+
+        doc_cache_invalidate(document_id)
+        self.set_output("success", True)
+        return json_dumps(merged)
+
+    @staticmethod
+    def _build_body(operations, required_revision_id: str) -> dict:
+        body = {"requests": operations}
+        required_revision_id = (required_revision_id or "").strip()
+        if required_revision_id:
+            # Optimistic concurrency enforced server-side: the write fails
+            # with 409 if the document moved past this revision, so no
+            # separate GET round-trip is needed to check.
+            body["writeControl"] = {"requiredRevisionId": required_revision_id}
+        return body
+
+    def _conflict_error(self, document_id: str) -> str:
+        msg = f"Revision conflict: document {document_id} changed since the required revision; re-read and retry"
+        self.set_output("_ERROR", msg)
+        self.set_output("success", False)
+        return f"GoogleDocsWrite conflict: {msg}"
+
+    @timeout(int(os.environ.get("COMPONENT_EXEC_TIMEOUT", 60)))
+    async def _invoke_async(self, **kwargs):
+        """Event-loop variant of _invoke: the batchUpdate round-trip is
+        awaited on a shared connection pool instead of blocking a worker
+        thread."""
+        if self.check_if_canceled("GoogleDocsWrite processing"):
+            return
+
+        document_id = kwargs.get("document_id", "").strip()
+        operations_str = kwargs.get("operations", "").strip()
+
+        if not document_id:
+            self.set_output("_ERROR", "document_id is required")
+            self.set_output("success", False)
+            return "Error: document_id is required"
+
+        if not valid_document_id(document_id):
+            self.set_output("_ERROR", f"invalid document_id: {document_id[:60]}")
+            self.set_output("success", False)
+            return f"Error: invalid document_id: {document_id[:60]}"
 
-        if last_e:
-            self.set_output("_ERROR", last_e)
+        if not operations_str:
+            self.set_output("_ERROR", "operations is required")
             self.set_output("success", False)
-            return f"GoogleDocsWrite error: {last_e}"
+            return "Error: operations is required"
 
-        assert False, self.output()
+        try:
+            operations = json_loads(operations_str)
+        except ValueError as e:
+            self.set_output("_ERROR", f"Invalid JSON in operations: {e}")
+            self.set_output("success", False)
+            return f"Error: Invalid JSON in operations: {e}"
+
+        invalid = validate_request_array(operations)
+        if invalid:
+            self.set_output("_ERROR", invalid)
+            self.set_output("success", False)
+            return f"Error: {invalid}"
+
+        operations = coalesce_operations(operations)
+
+        required_revision_id = (kwargs.get("required_revision_id", "") or "").strip()
+        merged = {"documentId": document_id, "replies": []}
+
+        try:
+            for start in range(0, len(operations), _MAX_OPS_PER_BATCH):
+                chunk = operations[start:start + _MAX_OPS_PER_BATCH]
+                result = await docs_request_async(
+                    "POST", f"{document_id}:batchUpdate", self._param.service_account_json, SCOPES,
+                    json_body=self._build_body(chunk, required_revision_id),
+                    max_retries=self._param.max_retries,
+                    base_delay=self._param.delay_after_error)
+                merged["replies"].extend(result.get("replies", []))
+                write_control = result.get("writeControl")
+                if write_control:
+                    merged["writeControl"] = write_control
+                    # Chain optimistic concurrency through subsequent chunks
+                    required_revision_id = write_control.get("requiredRevisionId", "")
+
+            doc_cache_invalidate(document_id)
+            self.set_output("success", True)
+            return json_dumps(merged)
+        except Exception as e:
+            # Earlier chunks may already have applied
+            doc_cache_invalidate(document_id)
+            if self._cancel_event.is_set():
+                return
+            if error_status(e) == 409:
+                return self._conflict_error(document_id)
+            logging.error("GoogleDocsWrite failed: %s", e, exc_info=e)
+            self.set_output("_ERROR", str(e))
+            self.set_output("success", False)
+            return f"GoogleDocsWrite error: {e}"
 
     def thoughts(self) -> str:
-        inputs = self.get_input()
-        doc_id = inputs.get("document_id", "")
-        return f"Writing to Google Doc: {doc_id[:30]}..." if doc_id else "Writing to Google Doc..."
+        # thoughts() fires on every trace event; cache the slice keyed on the
+        # current ID, since the tool object is reused across invocations with
+        # different documents
+        doc_id = self.get_input().get("document_id", "")
+        if getattr(self, "_doc_id_cached", None) != doc_id:
+            self._doc_id_cached = doc_id
+            self._doc_id_preview = doc_id[:30]
+        return f"Writing to Google Doc: {self._doc_id_preview}..." if self._doc_id_preview else "Writing to Google Doc..."
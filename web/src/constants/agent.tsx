@@ -100,6 +100,7 @@ export enum Operator {
   TavilyExtract = 'TavilyExtract',
   GoogleDocsRead = 'GoogleDocsRead',
   GoogleDocsWrite = 'GoogleDocsWrite',
+  GoogleDocsBatch = 'GoogleDocsBatch',
   UserFillUp = 'UserFillUp',
   StringTransform = 'StringTransform',
   SearXNG = 'SearXNG',
@@ -1995,6 +1995,9 @@ This process aggregates variables from multiple branches into a single variable
       googleDocsWrite: 'Google Docs Write',
       googleDocsWriteDescription:
         'A component that writes/updates content in Google Docs using batchUpdate operations.',
+      googleDocsBatch: 'Google Docs Batch',
+      googleDocsBatchDescription:
+        'A component that executes several Google Docs read/write operations in a single batched request.',
       serviceAccountJson: 'Service Account JSON',
       serviceAccountJsonPlaceholder:
         'Paste your Google Cloud service account JSON key here',
@@ -2036,6 +2039,7 @@ This process aggregates variables from multiple branches into a single variable
         gitHub: 'Searching GitHub',
         googleDocsRead: 'Reading Google Docs',
         googleDocsWrite: 'Writing to Google Docs',
+        googleDocsBatch: 'Updating Google Docs',
         email: 'Sending email',
         httpRequest: 'Calling an API',
         wenCai: 'Querying financial data',
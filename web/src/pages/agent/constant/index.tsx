@@ -577,6 +577,20 @@ export const initialGoogleDocsWriteValues = {
   },
 };
 
+export const initialGoogleDocsBatchValues = {
+  service_account_json: '',
+  outputs: {
+    result: {
+      value: '',
+      type: 'string',
+    },
+    success: {
+      value: true,
+      type: 'boolean',
+    },
+  },
+};
+
 export const initialPlaceholderValues = {
   // Placeholder node doesn't need any specific form values
   // It's just a visual placeholder
@@ -701,6 +715,7 @@ export const RestrictedUpstreamMap = {
   [Operator.TavilyExtract]: [Operator.Begin],
   [Operator.GoogleDocsRead]: [Operator.Begin],
   [Operator.GoogleDocsWrite]: [Operator.Begin],
+  [Operator.GoogleDocsBatch]: [Operator.Begin],
   [Operator.StringTransform]: [Operator.Begin],
   [Operator.UserFillUp]: [Operator.Begin],
   [Operator.Tool]: [Operator.Begin],
@@ -752,6 +767,7 @@ export const NodeMap = {
   [Operator.TavilySearch]: 'ragNode',
   [Operator.GoogleDocsRead]: 'ragNode',
   [Operator.GoogleDocsWrite]: 'ragNode',
+  [Operator.GoogleDocsBatch]: 'ragNode',
   [Operator.UserFillUp]: 'ragNode',
   [Operator.StringTransform]: 'ragNode',
   [Operator.TavilyExtract]: 'ragNode',
@@ -49,7 +49,11 @@ const Menus = [
   },
   {
     label: t('flow.productivity'),
-    list: [Operator.GoogleDocsRead, Operator.GoogleDocsWrite],
+    list: [
+      Operator.GoogleDocsRead,
+      Operator.GoogleDocsWrite,
+      Operator.GoogleDocsBatch,
+    ],
   },
 ];
 
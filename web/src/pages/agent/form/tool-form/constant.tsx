@@ -6,6 +6,7 @@ import DuckDuckGoForm from './duckduckgo-form';
 import EmailForm from './email-form';
 import ExeSQLForm from './exesql-form';
 import GithubForm from './github-form';
+import GoogleDocsBatchForm from './google-docs-batch-form';
 import GoogleDocsReadForm from './google-docs-read-form';
 import GoogleDocsWriteForm from './google-docs-write-form';
 import GoogleForm from './google-form';
@@ -39,4 +40,5 @@ export const ToolFormConfigMap = {
   [Operator.SearXNG]: SearXNGForm,
   [Operator.GoogleDocsRead]: GoogleDocsReadForm,
   [Operator.GoogleDocsWrite]: GoogleDocsWriteForm,
+  [Operator.GoogleDocsBatch]: GoogleDocsBatchForm,
 };
@@ -22,6 +22,7 @@ import {
   initialExeSqlValues,
   initialExtractorValues,
   initialGithubValues,
+  initialGoogleDocsBatchValues,
   initialGoogleDocsReadValues,
   initialGoogleDocsWriteValues,
   initialGoogleScholarValues,
@@ -165,6 +166,7 @@ export const useInitializeOperatorParams = () => {
       [Operator.TavilyExtract]: initialTavilyExtractValues,
       [Operator.GoogleDocsRead]: initialGoogleDocsReadValues,
       [Operator.GoogleDocsWrite]: initialGoogleDocsWriteValues,
+      [Operator.GoogleDocsBatch]: initialGoogleDocsBatchValues,
       [Operator.Placeholder]: {},
       [Operator.File]: {},
       [Operator.Parser]: initialParserValues,
@@ -45,6 +45,7 @@ export const SVGIconMap = {
   [Operator.GoogleScholar]: 'google-scholar',
   [Operator.GoogleDocsRead]: 'google',
   [Operator.GoogleDocsWrite]: 'google',
+  [Operator.GoogleDocsBatch]: 'google',
   [Operator.PubMed]: 'pubmed',
   [Operator.SearXNG]: 'searxng',
   [Operator.TavilyExtract]: 'tavily',